@@ -0,0 +1,254 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# 默认测量的输入规模 10^2 ~ 10^7
+DEFAULT_SIZES = [10 ** k for k in range(2, 8)]
+
+# 用于拟合经验复杂度的模型
+COMPLEXITY_MODELS = {
+    "O(1)": lambda n: np.ones_like(n),
+    "O(log n)": lambda n: np.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n^2)": lambda n: n ** 2,
+    "O(n^2 log n)": lambda n: n ** 2 * np.log2(n),
+}
+
+
+def _load(name, path):
+    """ 按路径加载模块，task1 和 task2 的入口文件都叫 main.py，不能直接 import """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def memory_targets(task1, seed):
+    """
+    task1 中每种分配策略的测试负载：先为 n 个进程分配内存，再回收其中一半，最后把回收的进程打乱后重新分配。
+    """
+
+    def make_inputs(n):
+        # 输入只由种子和规模决定，不同策略、不同次运行使用相同的输入
+        rng = np.random.default_rng([seed, n])
+        sizes = rng.integers(1, 100, n).tolist()
+        refill = rng.permutation(sizes[::2]).tolist()
+        return lambda: (sizes, refill)
+
+    def make_target(strategy):
+        def run(sizes, refill):
+            manager = task1.MemoryManager(sum(sizes))
+            # 分配失败时 MemoryManager 会打印提示，测量时忽略
+            with contextlib.redirect_stdout(io.StringIO()):
+                for pid, size in enumerate(sizes):
+                    manager.allocate(task1.Process(pid, size), strategy)
+                # 从高地址到低地址回收，保证尚未回收的内存块编号不变
+                block_ids = [block["block_id"] for block in manager.get_memory_state()][::2]
+                for block_id in reversed(block_ids):
+                    manager.free_memory(block_id)
+                for pid, size in enumerate(refill, start=len(sizes)):
+                    manager.allocate(task1.Process(pid, size), strategy)
+            return manager
+
+        return run
+
+    return {f"task1.{strategy}": (make_target(strategy), make_inputs)
+            for strategy in ["first_fit", "best_fit", "worst_fit"]}
+
+
+def schedule_targets(task2, testcase, seed, max_cylinder=10 ** 6):
+    """ task2 中每种调度算法的测试负载：n 个均匀分布、允许重复的请求 """
+
+    def make_inputs(n):
+        rng = np.random.default_rng([seed, n])
+        head_position = int(rng.integers(0, max_cylinder + 1))
+        requests = testcase.generate_requests(n, 0, max_cylinder, rng=rng).tolist()
+        # 调度函数会修改传入的请求列表，每次测量前复制一份
+        return lambda: (list(requests), head_position)
+
+    targets = {
+        "task2.fcfs": task2.fcfs,
+        "task2.sstf": task2.sstf,
+        "task2.scan (从小到大)": lambda requests, head_position: task2.scan(requests, head_position, "从小到大"),
+        "task2.scan (从大到小)": lambda requests, head_position: task2.scan(requests, head_position, "从大到小"),
+    }
+    return {name: (func, make_inputs) for name, func in targets.items()}
+
+
+def measure(func, make_args, repeat, track_memory, time_limit=math.inf):
+    """
+    某次运行超过 time_limit 秒时不再重复，也不再统计内存。
+    :return: (多次运行中的最短时间（秒）, 峰值内存（字节，不统计时为 None）)
+    """
+    best = math.inf
+    for _ in range(repeat):
+        args = make_args()
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        if elapsed > time_limit:
+            return best, None
+
+    peak = None
+    if track_memory:
+        args = make_args()
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+def _usable_points(sizes, seconds, min_seconds):
+    """ 去掉耗时过短、主要由固定开销决定的数据点 """
+    points = [(n, t) for n, t in zip(sizes, seconds) if t >= min_seconds]
+    return [n for n, _ in points], [t for _, t in points]
+
+
+def fit_complexity(sizes, seconds, min_seconds=1e-3):
+    """
+    拟合经验复杂度，耗时低于 min_seconds 的数据点不参与拟合。
+    :return: (log-log 回归得到的指数, 相对误差最小的复杂度模型)；有效数据点少于 3 个时返回 (None, None)
+    """
+    sizes, seconds = _usable_points(sizes, seconds, min_seconds)
+    if len(sizes) < 3:
+        return None, None
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(seconds, dtype=float)
+    exponent = float(np.polyfit(np.log(n), np.log(t), 1)[0])
+
+    best_model, best_error = None, math.inf
+    for name, model in COMPLEXITY_MODELS.items():
+        f = model(n)
+        # 最小化相对误差的缩放系数
+        scale = np.sum(f / t) / np.sum((f / t) ** 2)
+        error = float(np.sum((1 - scale * f / t) ** 2))
+        if error < best_error:
+            best_model, best_error = name, error
+    return exponent, best_model
+
+
+def estimate_seconds(runs, n, min_seconds=1e-3):
+    """
+    根据已测得的数据点按 log-log 斜率外推规模 n 的运行时间，有效数据点少于 2 个时返回 None。
+    """
+    sizes, seconds = _usable_points(list(runs.keys()), [run["seconds"] for run in runs.values()], min_seconds)
+    if len(sizes) < 2:
+        return None
+    exponent = np.polyfit(np.log(sizes), np.log(seconds), 1)[0]
+    return seconds[-1] * (n / sizes[-1]) ** max(exponent, 0.0)
+
+
+def run_benchmarks(targets, sizes, repeat=3, time_limit=10.0, track_memory=True, pattern=None):
+    """
+    依次在每个规模上运行所有测试目标。
+    某个目标单次运行超过 time_limit 秒，或按已测数据外推下一个规模会超过 time_limit 秒时，不再测量更大的规模。
+
+    :param targets: {目标名: (被测函数, make_inputs)}，make_inputs(n) 返回一个生成参数元组的函数
+    :return: {目标名: {"runs": {规模: {"seconds", "peak_bytes"}}, "exponent", "complexity"}}
+    """
+    results = {}
+    for name, (func, make_inputs) in targets.items():
+        if pattern and pattern not in name:
+            continue
+        runs = {}
+        for n in sizes:
+            estimate = estimate_seconds(runs, n)
+            if estimate is not None and estimate > time_limit:
+                print(f"{name:<24} n={n} 预计需要 {estimate:.1f}s，超过时间上限 {time_limit}s，跳过更大的规模")
+                break
+            make_args = make_inputs(n)
+            seconds, peak = measure(func, make_args, repeat, track_memory, time_limit)
+            runs[n] = {"seconds": seconds, "peak_bytes": peak}
+            print(f"{name:<24} n={n:<10} {seconds:10.4f}s" + (f" {peak / 2 ** 20:10.2f}MiB" if peak is not None else ""),
+                  flush=True)
+            if seconds > time_limit:
+                print(f"{name:<24} 超过时间上限 {time_limit}s，跳过更大的规模")
+                break
+        exponent, complexity = fit_complexity(list(runs.keys()), [run["seconds"] for run in runs.values()])
+        results[name] = {"runs": runs, "exponent": exponent, "complexity": complexity}
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold, min_seconds=1e-3):
+    """
+    与基线比较，运行时间超过基线 (1 + threshold) 倍的记录视为性能退化。
+    基线中测量过、本次却因超时未测到的规模同样视为退化，当前时间记为 None。
+    基线时间低于 min_seconds 的记录噪声太大，不参与比较。
+
+    :return: 退化记录列表 [(目标名, 规模, 当前时间, 基线时间)]
+    """
+    regressions = []
+    for name, result in results.items():
+        base_runs = baseline.get(name, {}).get("runs", {})
+        runs = {str(n): run for n, run in result["runs"].items()}
+        for n, base in sorted(base_runs.items(), key=lambda item: int(item[0])):
+            if base["seconds"] < min_seconds:
+                continue
+            run = runs.get(n)
+            if run is None:
+                regressions.append((name, int(n), None, base["seconds"]))
+            elif run["seconds"] > base["seconds"] * (1 + threshold):
+                regressions.append((name, int(n), run["seconds"], base["seconds"]))
+    return regressions
+
+
+def build_targets(seed=0):
+    task1 = _load("task1_main", os.path.join(ROOT, "task1", "main.py"))
+    task2 = _load("task2_main", os.path.join(ROOT, "task2", "main.py"))
+    testcase = _load("testcase", os.path.join(ROOT, "task2", "testcase.py"))
+    targets = memory_targets(task1, seed)
+    targets.update(schedule_targets(task2, testcase, seed))
+    return targets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="内存分配与磁盘调度的性能基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="输入规模")
+    parser.add_argument("--repeat", type=int, default=3, help="每个规模重复运行的次数，取最短时间")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="单次运行超过该秒数后不再测量更大的规模")
+    parser.add_argument("--filter", help="只运行名称中包含该字符串的测试目标")
+    parser.add_argument("--no-memory", action="store_true", help="不统计峰值内存")
+    parser.add_argument("--seed", type=int, default=0, help="生成输入的随机种子")
+    parser.add_argument("--output", help="将结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与该 JSON 基线比较，出现性能退化时以非零状态退出")
+    parser.add_argument("--threshold", type=float, default=0.2, help="允许的性能退化比例")
+    args = parser.parse_args()
+
+    results = run_benchmarks(build_targets(args.seed), args.sizes, args.repeat, args.time_limit,
+                             not args.no_memory, args.filter)
+
+    print("\n经验复杂度:")
+    for name, result in results.items():
+        if result["exponent"] is None:
+            print(f"{name:<24} 数据点不足")
+        else:
+            print(f"{name:<24} 指数 {result['exponent']:.2f}  最接近 {result['complexity']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n以下记录比基线慢 {args.threshold:.0%} 以上或未能测量:")
+            for name, n, seconds, base in regressions:
+                current = "未测量" if seconds is None else f"{seconds:.4f}s"
+                print(f"{name:<24} n={n:<10} {current} (基线 {base:.4f}s)")
+            sys.exit(1)
+        print("\n未发现性能退化")
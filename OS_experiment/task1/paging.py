@@ -0,0 +1,368 @@
+import heapq
+import random
+from collections import OrderedDict
+
+from main import Process
+
+# 页面置换算法，页面统一以 (进程编号, 页号) 标识，所有进程共享同一个物理页框池（全局置换）
+POLICIES = ["FIFO", "LRU", "CLOCK", "OPT"]
+
+
+class FIFOReplacer:
+    """ 先进先出：OrderedDict 记录装入顺序，淘汰最早装入的页面，O(1) """
+
+    def __init__(self):
+        self.pages = OrderedDict()
+
+    def advance(self):
+        pass
+
+    def hit(self, key):
+        pass
+
+    def insert(self, key):
+        self.pages[key] = None
+
+    def evict(self):
+        return self.pages.popitem(last=False)[0]
+
+    def remove(self, key):
+        self.pages.pop(key, None)
+
+
+class LRUReplacer:
+    """ 最近最少使用：命中时移动到 OrderedDict 末尾，淘汰头部页面，O(1) """
+
+    def __init__(self):
+        self.pages = OrderedDict()
+
+    def advance(self):
+        pass
+
+    def hit(self, key):
+        self.pages.move_to_end(key)
+
+    def insert(self, key):
+        self.pages[key] = None
+
+    def evict(self):
+        return self.pages.popitem(last=False)[0]
+
+    def remove(self, key):
+        self.pages.pop(key, None)
+
+
+class ClockReplacer:
+    """ 时钟算法：页面放在环形槽位中，指针跳过访问位为 1 的页面并清零，均摊 O(1) """
+
+    def __init__(self, capacity):
+        self.slots = [None] * capacity
+        self.referenced = [False] * capacity
+        self.slot_of = {}
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.hand = 0
+
+    def advance(self):
+        pass
+
+    def hit(self, key):
+        self.referenced[self.slot_of[key]] = True
+
+    def insert(self, key):
+        slot = self.free_slots.pop()
+        self.slots[slot] = key
+        self.referenced[slot] = True
+        self.slot_of[key] = slot
+
+    def evict(self):
+        while True:
+            key = self.slots[self.hand]
+            if key is not None and not self.referenced[self.hand]:
+                self.remove(key)
+                self.hand = (self.hand + 1) % len(self.slots)
+                return key
+            self.referenced[self.hand] = False
+            self.hand = (self.hand + 1) % len(self.slots)
+
+    def remove(self, key):
+        slot = self.slot_of.pop(key, None)
+        if slot is not None:
+            self.slots[slot] = None
+            self.referenced[slot] = False
+            self.free_slots.append(slot)
+
+
+class OPTReplacer:
+    """
+    最佳置换：预先计算每次访问之后同一页面的下一次访问位置，
+    用最大堆按下一次访问位置淘汰页面，堆中过期的记录在堆顶时丢弃，堆过大时整体重建，O(log n)。
+    """
+
+    def __init__(self, capacity, future):
+        self.capacity = capacity
+        self.next_use = next_use_indexes(future)
+        self.position = 0
+        self.upcoming = None  # 当前这次访问之后，被访问页面的下一次访问位置
+        self.current = {}  # 驻留页面 -> 下一次访问位置
+        self.heap = []
+
+    def advance(self):
+        """ 访问序列中的每一项都要调用一次，包括越界等被拒绝的访问，保证位置与序列对齐 """
+        if self.position >= len(self.next_use):
+            raise ValueError(f"OPT 预先给出的访问序列只有 {len(self.next_use)} 项，已经全部访问完")
+        self.upcoming = self.next_use[self.position]
+        self.position += 1
+
+    def _reference(self, key):
+        self.current[key] = self.upcoming
+        heapq.heappush(self.heap, (-self.upcoming, key))
+        if len(self.heap) > 2 * self.capacity:
+            self.heap = [(-next_use, resident) for resident, next_use in self.current.items()]
+            heapq.heapify(self.heap)
+        self._discard_stale()
+
+    def _discard_stale(self):
+        while self.heap and self.current.get(self.heap[0][1]) != -self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def hit(self, key):
+        self._reference(key)
+
+    def insert(self, key):
+        self._reference(key)
+
+    def evict(self):
+        self._discard_stale()
+        next_use, key = heapq.heappop(self.heap)
+        del self.current[key]
+        return key
+
+    def remove(self, key):
+        self.current.pop(key, None)
+
+
+def next_use_indexes(keys):
+    """ 从后向前扫描一次，得到每次访问之后同一页面下一次被访问的位置，不再访问时为 len(keys) """
+    next_use = [0] * len(keys)
+    last_seen = {}
+    for i in range(len(keys) - 1, -1, -1):
+        next_use[i] = last_seen.get(keys[i], len(keys))
+        last_seen[keys[i]] = i
+    return next_use
+
+
+def create_replacer(policy, capacity, future=None):
+    if policy == "FIFO":
+        return FIFOReplacer()
+    elif policy == "LRU":
+        return LRUReplacer()
+    elif policy == "CLOCK":
+        return ClockReplacer(capacity)
+    elif policy == "OPT":
+        if future is None:
+            raise ValueError("OPT 算法需要预先给出完整的访问序列")
+        return OPTReplacer(capacity, future)
+    raise ValueError(f"未知的页面置换算法: {policy}")
+
+
+class PagedMemoryManager:
+    def __init__(self, total_memory, page_size, policy="LRU", future=None):
+        """
+        :param total_memory: 物理内存大小，划分为 total_memory // page_size 个页框
+        :param page_size: 页面大小
+        :param policy: 页面置换算法，见 POLICIES
+        :param future: OPT 算法需要的完整访问序列 [(pid, 逻辑地址), ...]
+        """
+        self.total_memory = total_memory
+        self.page_size = page_size
+        self.num_frames = total_memory // page_size
+        if self.num_frames < 1:
+            raise ValueError("物理内存至少需要容纳一个页面")
+        if future is not None:
+            future = [(pid, address // page_size) for pid, address in future]
+        self.replacer = create_replacer(policy, self.num_frames, future)
+        self.frames = [None] * self.num_frames  # 页框 -> (pid, 页号)
+        self.free_frames = list(range(self.num_frames - 1, -1, -1))
+        self.page_tables = {}  # pid -> 页表，页表项为页框号，不在内存中时为 None
+        self.processes = []
+        self.hits = 0
+        self.faults = 0
+
+    def allocate(self, process):
+        """ 为进程建立页表，页面在第一次访问时才调入（请求分页） """
+        if process.pid in self.page_tables:
+            print(f"进程 {process.pid} 已经分配过页表")
+            return None
+        num_pages = -(-process.size // self.page_size)
+        self.page_tables[process.pid] = [None] * num_pages
+        self.processes.append(process)
+        process.status = "已分配"
+        return num_pages
+
+    def access(self, pid, address):
+        """
+        访问进程的逻辑地址，缺页时调入页面，必要时按置换算法淘汰页面。
+        OPT 算法下访问次数超过预先给出的访问序列时抛出 ValueError。
+        :return: 物理地址，地址越界时返回 None
+        """
+        # 被拒绝的访问也占用访问序列中的一项
+        self.replacer.advance()
+        page_table = self.page_tables.get(pid)
+        if page_table is None:
+            print(f"没有找到编号为 {pid} 的进程")
+            return None
+        page, offset = divmod(address, self.page_size)
+        if address < 0 or page >= len(page_table):
+            print(f"进程 {pid} 访问的地址 {address} 越界")
+            return None
+
+        frame = page_table[page]
+        if frame is not None:
+            self.hits += 1
+            self.replacer.hit((pid, page))
+        else:
+            self.faults += 1
+            if self.free_frames:
+                frame = self.free_frames.pop()
+            else:
+                victim_pid, victim_page = self.replacer.evict()
+                frame = self.page_tables[victim_pid][victim_page]
+                self.page_tables[victim_pid][victim_page] = None
+            self.frames[frame] = (pid, page)
+            page_table[page] = frame
+            self.replacer.insert((pid, page))
+        return frame * self.page_size + offset
+
+    def free(self, pid):
+        """ 回收进程占用的全部页框 """
+        page_table = self.page_tables.pop(pid, None)
+        if page_table is None:
+            print(f"没有找到编号为 {pid} 的进程")
+            return False
+        for page, frame in enumerate(page_table):
+            if frame is not None:
+                self.replacer.remove((pid, page))
+                self.frames[frame] = None
+                self.free_frames.append(frame)
+        for process in self.processes:
+            if process.pid == pid:
+                process.status = "未分配"
+        self.processes = [p for p in self.processes if p.pid != pid]
+        return True
+
+    def fault_rate(self):
+        total = self.hits + self.faults
+        return self.faults / total if total else 0.0
+
+    def get_frame_state(self):
+        """ 获取当前页框状态 """
+        return [{"frame": frame, "process": entry[0] if entry else "空闲", "page": entry[1] if entry else None}
+                for frame, entry in enumerate(self.frames)]
+
+
+def simulate_paging(processes, trace, total_memory, page_size, policy="LRU"):
+    """
+    在分页模式下运行一条访问序列。
+
+    :param processes: Process 列表
+    :param trace: 访问序列 [(pid, 逻辑地址), ...]
+    :return: PagedMemoryManager，可从中读取命中次数和缺页次数
+    """
+    manager = PagedMemoryManager(total_memory, page_size, policy, trace if policy == "OPT" else None)
+    for process in processes:
+        manager.allocate(process)
+    for pid, address in trace:
+        manager.access(pid, address)
+    return manager
+
+
+def stack_distances(keys):
+    """
+    Mattson 栈距离：每次访问的页面在 LRU 栈中的深度，第一次访问记为 0（冷缺页）。
+    用树状数组记录每个页面最近一次访问的位置，两次访问之间出现过的不同页面数即为栈距离，O(n log n)。
+    """
+    n = len(keys)
+    tree = [0] * (n + 1)
+
+    def add(i, delta):
+        i += 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(i):
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    distances = [0] * n
+    last_seen = {}
+    for t, key in enumerate(keys):
+        previous = last_seen.get(key)
+        if previous is not None:
+            # (previous, t) 之间被访问过的不同页面数，再加上该页面自身
+            distances[t] = prefix(t) - prefix(previous + 1) + 1
+            add(previous, -1)
+        add(t, 1)
+        last_seen[key] = t
+    return distances
+
+
+def lru_miss_curve(trace, page_size, max_frames=None):
+    """
+    一次扫描访问序列，得到 LRU 在每个页框数下的缺页率。
+
+    :param trace: 访问序列 [(pid, 逻辑地址), ...]
+    :param max_frames: 计算到的最大页框数，默认为访问过的不同页面数
+    :return: 列表，第 c 项为 c 个页框时的缺页率
+    """
+    keys = [(pid, address // page_size) for pid, address in trace]
+    distances = stack_distances(keys)
+    if max_frames is None:
+        max_frames = len(set(keys))
+
+    # histogram[d] 为栈距离等于 d 的访问次数，页框数为 c 时栈距离大于 c 或为 0 的访问缺页
+    histogram = [0] * (max_frames + 2)
+    for d in distances:
+        histogram[min(d, max_frames + 1)] += 1
+    curve = []
+    misses = len(keys)
+    for c in range(max_frames + 1):
+        if c > 0:
+            misses -= histogram[c]
+        curve.append(misses / len(keys) if keys else 0.0)
+    return curve
+
+
+def generate_trace(processes, length, locality=0.9, window=4, page_size=1):
+    """ 生成带局部性的访问序列：大多数访问落在当前工作集附近，偶尔跳到其他进程或其他位置 """
+    trace = []
+    process = random.choice(processes)
+    address = 0
+    for _ in range(length):
+        if random.random() > locality:
+            process = random.choice(processes)
+            address = random.randrange(process.size)
+        else:
+            address = min(max(address + random.randint(-window, window) * page_size, 0), process.size - 1)
+        trace.append((process.pid, address))
+    return trace
+
+
+if __name__ == "__main__":
+    page_size = 16
+    processes = [Process(pid, size) for pid, size in enumerate([400, 800, 300, 1200], start=1)]
+    trace = generate_trace(processes, 20000, page_size=page_size)
+
+    curve = lru_miss_curve(trace, page_size)
+    print("页框数  " + "  ".join(f"{policy:>6}" for policy in POLICIES) + "  LRU(栈距离)")
+    for frames in [4, 8, 16, 32, 64]:
+        rates = []
+        for policy in POLICIES:
+            manager = simulate_paging([Process(p.pid, p.size) for p in processes], trace,
+                                      frames * page_size, page_size, policy)
+            rates.append(manager.fault_rate())
+        print(f"{frames:>6}  " + "  ".join(f"{rate:>6.2%}" for rate in rates)
+              + f"  {curve[min(frames, len(curve) - 1)]:>6.2%}")
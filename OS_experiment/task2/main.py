@@ -1,11 +1,125 @@
 import sys
+import numpy as np
+from matplotlib import rcParams
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from PyQt5.QtCore import Qt, QObject, QThread, QAbstractListModel, QModelIndex, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QComboBox, \
-    QTextEdit, QDesktopWidget
+    QTextEdit, QDesktopWidget, QProgressBar, QListView
+
+# 设置默认字体为 SimHei
+rcParams['font.sans-serif'] = ['SimHei']
+# 解决负号问题
+rcParams['axes.unicode_minus'] = False
+
+# 绘制磁头移动轨迹时最多保留的点数，超过后按区间降采样
+MAX_PLOT_POINTS = 2000
+
+
+class ScheduleCancelled(Exception):
+    pass
+
+
+class ScheduleWorker(QObject):
+    """ 在后台线程中解析输入并运行调度算法，避免阻塞界面 """
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object, object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, head_text, requests_text, algorithm, direction):
+        super().__init__()
+        self.head_text = head_text
+        self.requests_text = requests_text
+        self.algorithm = algorithm
+        self.direction = direction
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def report(self, done, total):
+        """ 由调度算法周期性调用，用于汇报进度和响应取消 """
+        if self._cancelled:
+            raise ScheduleCancelled()
+        self.progress.emit(int(done * 100 / total) if total else 100)
+
+    def run(self):
+        try:
+            head_position = int(self.head_text)
+            requests = list(map(int, self.requests_text.split(',')))
+            num_requests = len(requests)
+
+            if self.algorithm == '先来先服务法':
+                total_movement, access_order = fcfs(requests, head_position, self.report)
+            elif self.algorithm == '最短寻道时间优先':
+                total_movement, access_order = sstf(requests, head_position, self.report)
+            else:
+                total_movement, access_order = scan(requests, head_position, self.direction, self.report)
+        except ScheduleCancelled:
+            self.failed.emit('已取消')
+        except ValueError:
+            self.failed.emit('请输入有效的磁头位置和访问序列')
+        except Exception as e:
+            # 其他异常（如输入过大导致 MemoryError）也要通知界面，否则线程不会退出，计算按钮一直不可用
+            self.failed.emit(f'计算失败: {type(e).__name__}: {e}')
+        else:
+            # 统计信息也在后台线程中计算，部分算法的访问顺序以初始磁头位置开头，统计时去掉
+            served = access_order[len(access_order) - num_requests:]
+            seeks = np.abs(np.diff(np.asarray([head_position] + served)))
+            stats = {
+                '请求数量': num_requests,
+                '平均寻道长度': float(seeks.mean()) if num_requests else 0.0,
+                '最大单次寻道': int(seeks.max()) if num_requests else 0,
+            }
+            self.progress.emit(100)
+            self.finished.emit(total_movement, access_order, stats)
+
+
+class AccessOrderModel(QAbstractListModel):
+    """ 调度顺序的列表模型，QListView 只会请求可见行的数据 """
+
+    def __init__(self, access_order=None):
+        super().__init__()
+        self.access_order = access_order or []
+
+    def set_access_order(self, access_order):
+        self.beginResetModel()
+        self.access_order = access_order
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.access_order)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return f'{index.row() + 1}: {self.access_order[index.row()]}'
+        return None
+
+
+def downsample_path(access_order, max_points=MAX_PLOT_POINTS):
+    """
+    对磁头移动轨迹降采样。
+    将轨迹划分为 max_points // 2 个区间，每个区间保留最小值和最大值，保证折返点不会丢失。
+    :return: (横坐标, 纵坐标)
+    """
+    path = np.asarray(access_order)
+    if len(path) <= max_points:
+        return np.arange(len(path)), path
+
+    buckets = max_points // 2
+    edges = np.linspace(0, len(path), buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+    lows = starts + np.array([np.argmin(path[s:e]) for s, e in zip(edges[:-1], edges[1:])])
+    highs = starts + np.array([np.argmax(path[s:e]) for s, e in zip(edges[:-1], edges[1:])])
+    index = np.unique(np.concatenate([lows, highs]))
+    return index, path[index]
 
 
 class DiskSchedulerApp(QWidget):
     def __init__(self):
         super().__init__()
+        self.worker_thread = None
+        self.worker = None
         self.initUI()
 
     def initUI(self):
@@ -18,13 +132,34 @@ class DiskSchedulerApp(QWidget):
         layout = QVBoxLayout()
         self.head_position_input = QLineEdit(self)
         self.requests_input = QLineEdit(self)
+        self.requests_input.setMaxLength(2 ** 31 - 1)  # 默认最多只能输入 32767 个字符
         self.algorithm_selector = QComboBox(self)
         self.algorithm_selector.addItems(['先来先服务法', '最短寻道时间优先', '电梯算法'])
         self.direction_selector = QComboBox(self)
         self.direction_selector.addItems(['从小到大', '从大到小'])
         self.calculate_button = QPushButton('计算', self)
+        self.cancel_button = QPushButton('取消', self)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar = QProgressBar(self)
         self.result_display = QTextEdit(self)
         self.result_display.setReadOnly(True)
+        self.result_display.setMaximumHeight(200)
+
+        # 调度顺序使用虚拟化列表显示，图中显示降采样后的磁头移动轨迹
+        self.order_model = AccessOrderModel()
+        self.order_view = QListView(self)
+        self.order_view.setUniformItemSizes(True)
+        self.order_view.setModel(self.order_model)
+        self.figure = Figure()
+        self.canvas = FigureCanvasQTAgg(self.figure)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.calculate_button)
+        button_layout.addWidget(self.cancel_button)
+
+        result_layout = QHBoxLayout()
+        result_layout.addWidget(self.order_view, 1)
+        result_layout.addWidget(self.canvas, 2)
 
         layout.addWidget(QLabel('初始磁头的位置:'))
         layout.addWidget(self.head_position_input)
@@ -34,13 +169,16 @@ class DiskSchedulerApp(QWidget):
         layout.addWidget(self.algorithm_selector)
         layout.addWidget(QLabel('选择方向（当使用电梯算法时需要指定）:'))
         layout.addWidget(self.direction_selector)
-        layout.addWidget(self.calculate_button)
+        layout.addLayout(button_layout)
+        layout.addWidget(self.progress_bar)
         layout.addWidget(QLabel('运行结果:'))
         layout.addWidget(self.result_display)
+        layout.addLayout(result_layout)
 
         self.setLayout(layout)
 
         self.calculate_button.clicked.connect(self.calculate_disk_schedule)
+        self.cancel_button.clicked.connect(self.cancel_disk_schedule)
 
         self.setStyleSheet("""
             QLabel { font-size: 30px; }
@@ -48,40 +186,94 @@ class DiskSchedulerApp(QWidget):
             QComboBox { font-size: 30px; }
             QPushButton { font-size: 30px; }
             QTextEdit { font-size: 30px; }
+            QListView { font-size: 24px; }
         """)
 
     def calculate_disk_schedule(self):
-        head_position = int(self.head_position_input.text())
-        requests = list(map(int, self.requests_input.text().split(',')))
-        algorithm = self.algorithm_selector.currentText()
-        direction = self.direction_selector.currentText()
+        if self.worker_thread is not None:
+            return
+
+        self.worker = ScheduleWorker(self.head_position_input.text(), self.requests_input.text(),
+                                     self.algorithm_selector.currentText(), self.direction_selector.currentText())
+        self.worker_thread = QThread()
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.progress.connect(self.progress_bar.setValue)
+        self.worker.finished.connect(self.show_result)
+        self.worker.failed.connect(self.show_failure)
+        self.worker.finished.connect(self.worker_thread.quit)
+        self.worker.failed.connect(self.worker_thread.quit)
+        self.worker_thread.finished.connect(self.on_thread_finished)
+
+        self.progress_bar.setValue(0)
+        self.calculate_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.result_display.setText('计算中...')
+        self.worker_thread.start()
+
+    def cancel_disk_schedule(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def on_thread_finished(self):
+        self.worker_thread.deleteLater()
+        self.worker.deleteLater()
+        self.worker_thread = None
+        self.worker = None
+        self.calculate_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def show_result(self, total_movement, access_order, stats):
+        # 只显示统计信息，完整的调度顺序交给列表视图按需渲染
+        self.result_display.setText(f'总移动长度: {total_movement}\n'
+                                    f'请求数量: {stats["请求数量"]}\n'
+                                    f'平均寻道长度: {stats["平均寻道长度"]:.2f}    最大单次寻道: {stats["最大单次寻道"]}')
+        self.order_model.set_access_order(access_order)
+        self.plot_head_movement(access_order)
 
-        if algorithm == '先来先服务法':
-            total_movement, access_order = fcfs(requests, head_position)
-        elif algorithm == '最短寻道时间优先':
-            total_movement, access_order = sstf(requests, head_position)
-        elif algorithm == '电梯算法':
-            total_movement, access_order = scan(requests, head_position, direction)
+    def show_failure(self, message):
+        # 清除上一次的结果，避免与错误信息同时显示
+        self.result_display.setText(message)
+        self.order_model.set_access_order([])
+        self.figure.clear()
+        self.canvas.draw_idle()
 
-        self.result_display.setText(f'总移动长度: {total_movement}\n调度顺序: {access_order}')
+    def plot_head_movement(self, access_order):
+        x, y = downsample_path(access_order)
+        self.figure.clear()
+        ax = self.figure.add_subplot(111)
+        ax.plot(x, y, linewidth=0.8)
+        ax.set_xlabel('访问次序')
+        ax.set_ylabel('磁道号')
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
 
 
-def fcfs(requests, head_position):
+def _progress_step(total):
+    return max(1, total // 100)
+
+
+def fcfs(requests, head_position, callback=None):
     total_movement = 0
     access_order = []
-    for request in requests:
+    step = _progress_step(len(requests))
+    for i, request in enumerate(requests):
         total_movement += abs(head_position - request)
         head_position = request
         access_order.append(request)
+        if callback and i % step == 0:
+            callback(i, len(requests))
     return total_movement, access_order
 
 
-def sstf(requests, head_position):
+def sstf(requests, head_position, callback=None):
     requests.sort()
     closest_index = min(range(len(requests)), key=lambda i: abs(requests[i] - head_position))
     total_movement = 0
     current_position = head_position
     access_order = [head_position]
+    total = len(requests)
+    step = _progress_step(total)
 
     while requests:
         next_request = requests.pop(closest_index)
@@ -90,54 +282,34 @@ def sstf(requests, head_position):
         access_order.append(next_request)
         if requests:
             closest_index = min(range(len(requests)), key=lambda i: abs(requests[i] - current_position))
+        if callback and len(requests) % step == 0:
+            callback(total - len(requests), total)
 
     return total_movement, access_order
 
 
-def scan(requests, head_position, direction):
+def scan(requests, head_position, direction, callback=None):
+    """
+    电梯算法：先沿指定方向（从小到大即磁道号增大的方向）服务，到达该方向最远的请求后折返，
+    与 test.py 中的 scan 一致；该方向上没有请求时直接向另一方向移动。
+    """
     requests.sort()
-    access_order = [head_position]
     if direction == "从小到大":
-        total_movement = 0
-        pos = 0
-        for i in range(0,len(requests)):
-            if requests[i]<=head_position:
-                pos = i
-        pos1 = pos
-        while pos1 >= 0:
-            access_order.append(requests[pos1])
-            total_movement += abs(head_position - requests[pos1])
-            head_position = requests[pos1]
-            pos1 -= 1
-        pos+=1
-        head_position = requests[0]
-        while pos<len(requests):
-            access_order.append(requests[pos])
-            total_movement += abs(head_position - requests[pos])
-            head_position = requests[pos]
-            pos+=1
+        order = [request for request in requests if request >= head_position]
+        order += [request for request in reversed(requests) if request < head_position]
     else:
-        total_movement = 0
-        pos = 0
-        for i in range(0, len(requests)):
-            if requests[i] >= head_position:
-                pos = i
-                break
-        pos1 = pos
-        while pos1 < len(requests):
-            access_order.append(requests[pos1])
-            total_movement += abs(head_position - requests[pos1])
-            head_position = requests[pos1]
-            pos1 += 1
-        pos -= 1
-        head_position = requests[len(requests)-1]
-        while pos >= 0:
-            access_order.append(requests[pos])
-            total_movement += abs(head_position - requests[pos])
-            head_position = requests[pos]
-            pos -= 1
-    print(total_movement)
-    print(access_order)
+        order = [request for request in reversed(requests) if request <= head_position]
+        order += [request for request in requests if request > head_position]
+
+    total_movement = 0
+    access_order = [head_position]
+    step = _progress_step(len(order))
+    for i, request in enumerate(order):
+        total_movement += abs(head_position - request)
+        head_position = request
+        access_order.append(request)
+        if callback and i % step == 0:
+            callback(i, len(order))
     return total_movement, access_order
 
 
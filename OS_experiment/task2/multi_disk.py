@@ -0,0 +1,296 @@
+import bisect
+import heapq
+import numbers
+import os
+import sys
+from collections import deque
+
+from main import fcfs, sstf, scan
+
+# 每个磁盘上可选的调度算法，统一为 (requests, head_position) -> (total_movement, access_order)
+ALGORITHMS = {
+    "先来先服务法": fcfs,
+    "最短寻道时间优先": sstf,
+    "电梯算法 (从小到大)": lambda requests, head_position: scan(requests, head_position, "从小到大"),
+    "电梯算法 (从大到小)": lambda requests, head_position: scan(requests, head_position, "从大到小"),
+}
+
+LAYOUTS = ["条带化", "镜像"]
+
+# 镜像布局中电梯算法的初始移动方向，1 为磁道号增大的方向
+SCAN_DIRECTIONS = {
+    "电梯算法 (从小到大)": 1,
+    "电梯算法 (从大到小)": -1,
+}
+
+
+class Disk:
+    def __init__(self, disk_id, head_position):
+        self.disk_id = disk_id
+        self.head_position = head_position  # 初始磁头位置
+        self.position = head_position  # 模拟过程中的当前磁头位置
+        self.direction = None  # 电梯算法当前的移动方向
+        self.queue = []  # 分配到该盘的物理柱面请求，镜像布局中按服务顺序排列
+        self.total_movement = 0
+        self.busy_time = 0.0
+        self.completions = []  # (完成时刻, 柱面)
+
+
+class PendingRequests:
+    """
+    镜像布局中共享的等待队列。
+    先来先服务按到达顺序取请求；最短寻道时间优先和电梯算法在有序列表上二分查找，
+    与 main.py 中对应算法的选择规则一致（距离相同时优先较小的磁道，电梯算法到头后折返）。
+    """
+
+    def __init__(self, algorithm, requests):
+        self.algorithm = algorithm
+        if algorithm == "先来先服务法":
+            self.queue = deque(requests)
+        else:
+            self.sorted = sorted(requests)
+
+    def __len__(self):
+        return len(self.queue) if self.algorithm == "先来先服务法" else len(self.sorted)
+
+    def candidate(self, disk):
+        """ 磁盘按自己的算法和当前磁头位置选出的下一个请求，返回 (请求, 选择后的移动方向) """
+        if self.algorithm == "先来先服务法":
+            return self.queue[0], disk.direction
+
+        index = bisect.bisect_left(self.sorted, disk.position)
+        if self.algorithm == "最短寻道时间优先":
+            below = self.sorted[index - 1] if index > 0 else None
+            above = self.sorted[index] if index < len(self.sorted) else None
+            if above is None or (below is not None and disk.position - below <= above - disk.position):
+                return below, disk.direction
+            return above, disk.direction
+
+        if disk.direction > 0:
+            if index < len(self.sorted):
+                return self.sorted[index], 1
+            return self.sorted[-1], -1
+        index = bisect.bisect_right(self.sorted, disk.position) - 1
+        if index >= 0:
+            return self.sorted[index], -1
+        return self.sorted[0], 1
+
+    def take(self, request):
+        if self.algorithm == "先来先服务法":
+            self.queue.popleft()
+        else:
+            del self.sorted[bisect.bisect_left(self.sorted, request)]
+
+
+class DiskArray:
+    def __init__(self, num_disks, layout="条带化", stripe_size=1, head_position=0):
+        """
+        :param num_disks: 阵列中磁盘的数量 K
+        :param layout: "条带化"（RAID 0）或 "镜像"（RAID 1）
+        :param stripe_size: 条带化时每个条带单元包含的柱面数
+        :param head_position: 各磁盘的初始磁头位置，可以是整数（包括 NumPy 整数）或长度为 K 的列表
+        """
+        if num_disks < 1:
+            raise ValueError("磁盘数量必须大于 0")
+        if layout not in LAYOUTS:
+            raise ValueError(f"未知的阵列布局: {layout}")
+        if stripe_size < 1:
+            raise ValueError("条带大小必须大于 0")
+        if isinstance(head_position, numbers.Integral):
+            head_position = [head_position] * num_disks
+        if len(head_position) != num_disks:
+            raise ValueError("初始磁头位置的个数与磁盘数量不匹配")
+
+        self.num_disks = num_disks
+        self.layout = layout
+        self.stripe_size = stripe_size
+        self.disks = [Disk(i + 1, head) for i, head in enumerate(head_position)]
+
+    def map_request(self, request):
+        """ 条带化布局下，将逻辑柱面映射为 (磁盘下标, 物理柱面) """
+        stripe, offset = divmod(request, self.stripe_size)
+        row, disk_index = divmod(stripe, self.num_disks)
+        return disk_index, row * self.stripe_size + offset
+
+    def route(self, requests):
+        """ 条带化布局下，按到达顺序把逻辑请求分配到所在成员磁盘的队列 """
+        for disk in self.disks:
+            disk.queue = []
+        for request in requests:
+            disk_index, cylinder = self.map_request(request)
+            self.disks[disk_index].queue.append(cylinder)
+
+    def dispatch(self, requests, algorithm, seek_time, service_time):
+        """
+        镜像布局下的事件驱动模拟：所有请求在 0 时刻到达共享的等待队列，每块磁盘都保存完整数据。
+        每当有磁盘空闲，就按各自的调度算法、以磁盘当前的实际磁头位置选出候选请求；
+        同一时刻有多块磁盘空闲时，选择寻道距离最短的 (磁盘, 请求) 组合，
+        即请求交给磁头离它最近的空闲镜像。磁盘完成一次服务后在新的时刻重新加入空闲队列。
+        """
+        pending = PendingRequests(algorithm, requests)
+        idle = []
+        for disk in self.disks:
+            disk.queue = []
+            disk.position = disk.head_position
+            disk.direction = SCAN_DIRECTIONS.get(algorithm)
+            heapq.heappush(idle, (0.0, disk.disk_id))
+
+        while pending:
+            clock, disk_id = heapq.heappop(idle)
+            ready = [disk_id]
+            while idle and idle[0][0] == clock:
+                ready.append(heapq.heappop(idle)[1])
+
+            choices = []
+            for ready_id in ready:
+                disk = self.disks[ready_id - 1]
+                request, direction = pending.candidate(disk)
+                choices.append((abs(request - disk.position), ready_id, request, direction))
+            distance, chosen_id, request, direction = min(choices)
+
+            disk = self.disks[chosen_id - 1]
+            pending.take(request)
+            disk.direction = direction
+            disk.total_movement += distance
+            disk.position = request
+            disk.queue.append(request)
+            finish = clock + distance * seek_time + service_time
+            disk.completions.append((finish, request))
+            disk.busy_time = finish
+            for ready_id in ready:
+                heapq.heappush(idle, (finish if ready_id == chosen_id else clock, ready_id))
+
+    def run(self, requests, algorithm="最短寻道时间优先", seek_time=0.1, service_time=5.0):
+        """
+        将请求分配到各磁盘并运行调度算法，所有磁盘在同一模拟时钟下并行推进。
+        条带化时各盘独立调度；镜像时见 dispatch。
+
+        :param requests: 逻辑请求序列
+        :param algorithm: ALGORITHMS 中的算法名称
+        :param seek_time: 磁头每移动一个柱面所需时间（毫秒）
+        :param service_time: 每个请求的固定服务时间（旋转延迟 + 传输，毫秒）
+        :return: 统计结果字典，见 summarize
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"未知的调度算法: {algorithm}")
+        schedule = ALGORITHMS[algorithm]
+
+        for disk in self.disks:
+            disk.total_movement = 0
+            disk.busy_time = 0.0
+            disk.completions = []
+
+        if self.layout == "镜像":
+            self.dispatch(requests, algorithm, seek_time, service_time)
+            return self.summarize()
+
+        # 条带化时每个请求只能由所在的磁盘服务，各盘互不影响，可以分别调度
+        self.route(requests)
+        for disk in self.disks:
+            if not disk.queue:
+                continue
+
+            # 算法会修改传入的列表，且部分算法的访问顺序以初始磁头位置开头，只保留真正服务的请求
+            total_movement, access_order = schedule(list(disk.queue), disk.head_position)
+            access_order = access_order[len(access_order) - len(disk.queue):]
+
+            position = disk.head_position
+            clock = 0.0
+            for cylinder in access_order:
+                clock += abs(cylinder - position) * seek_time + service_time
+                position = cylinder
+                disk.completions.append((clock, cylinder))
+            disk.total_movement = total_movement
+            disk.busy_time = clock
+
+        return self.summarize()
+
+    def summarize(self):
+        """ 汇总吞吐量、各磁盘利用率和负载不均衡度 """
+        total_requests = sum(len(disk.queue) for disk in self.disks)
+        makespan = max(disk.busy_time for disk in self.disks)
+        loads = [len(disk.queue) for disk in self.disks]
+        mean_load = total_requests / self.num_disks
+        mean_busy = sum(disk.busy_time for disk in self.disks) / self.num_disks
+        response_times = [time for disk in self.disks for time, _ in disk.completions]
+
+        return {
+            "磁盘数量": self.num_disks,
+            "总请求数": total_requests,
+            "总移动长度": sum(disk.total_movement for disk in self.disks),
+            "完成时间": makespan,
+            # 每秒完成的请求数（模拟时间以毫秒为单位）
+            "吞吐量": total_requests / makespan * 1000 if makespan > 0 else 0.0,
+            "平均响应时间": sum(response_times) / len(response_times) if response_times else 0.0,
+            "各磁盘请求数": loads,
+            "各磁盘移动长度": [disk.total_movement for disk in self.disks],
+            "各磁盘利用率": [disk.busy_time / makespan if makespan > 0 else 0.0 for disk in self.disks],
+            # 最大负载与平均负载之比，1 表示完全均衡
+            "请求不均衡度": max(loads) / mean_load if mean_load > 0 else 0.0,
+            "时间不均衡度": makespan / mean_busy if mean_busy > 0 else 0.0,
+        }
+
+
+def simulate_array(requests, head_position, num_disks, layout="条带化", algorithm="最短寻道时间优先",
+                   stripe_size=1, seek_time=0.1, service_time=5.0):
+    """
+    在 K 块磁盘组成的阵列上模拟一次调度。
+
+    :return: 统计结果字典
+    """
+    array = DiskArray(num_disks, layout, stripe_size, head_position)
+    return array.run(requests, algorithm, seek_time, service_time)
+
+
+def scaling_sweep(sample_data, disk_counts, layout="条带化", algorithm="最短寻道时间优先", stripe_size=1):
+    """
+    对每个磁盘数量运行全部样例，统计平均吞吐量、平均利用率和平均不均衡度，用于观察算法随磁盘数增加的扩展性。
+    """
+    results = {}
+    for num_disks in disk_counts:
+        throughputs = []
+        utilisations = []
+        imbalances = []
+        for head_position, requests in sample_data:
+            # 条带化时逻辑地址空间被 K 块磁盘均分，初始磁头按同样的方式映射
+            if layout == "条带化":
+                head = (head_position // (stripe_size * num_disks)) * stripe_size
+            else:
+                head = head_position
+            stats = simulate_array(requests, head, num_disks, layout, algorithm, stripe_size)
+            throughputs.append(stats["吞吐量"])
+            utilisations.append(sum(stats["各磁盘利用率"]) / num_disks)
+            imbalances.append(stats["时间不均衡度"])
+        results[num_disks] = {
+            "吞吐量": sum(throughputs) / len(throughputs),
+            "平均利用率": sum(utilisations) / len(utilisations),
+            "时间不均衡度": sum(imbalances) / len(imbalances),
+        }
+    return results
+
+
+def load_sample_data(file_name):
+    """ 读取样例文件，每一行的格式为：磁头位置,请求1,请求2,... """
+    sample_data = []
+    with open(file_name, 'r') as file:
+        for line in file:
+            parts = line.strip().split(',')
+            if len(parts) > 1:
+                sample_data.append((int(parts[0]), list(map(int, parts[1:]))))
+    return sample_data
+
+
+if __name__ == "__main__":
+    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "large_samples.txt")
+    if not os.path.exists(file_path):
+        print("文件不存在，请检查路径。")
+        sys.exit(1)
+
+    sample_data = load_sample_data(file_path)
+    disk_counts = [1, 2, 4, 8]
+    for layout in LAYOUTS:
+        for algorithm in ALGORITHMS:
+            print(f"{layout} - {algorithm}:")
+            for num_disks, stats in scaling_sweep(sample_data, disk_counts, layout, algorithm).items():
+                print(f"  K={num_disks}: 吞吐量 {stats['吞吐量']:.1f} 次/秒, "
+                      f"平均利用率 {stats['平均利用率']:.2%}, 时间不均衡度 {stats['时间不均衡度']:.2f}")
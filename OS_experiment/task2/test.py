@@ -1,7 +1,12 @@
+import argparse
+import csv
+import json
+import os
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
-import os
+from matplotlib.figure import Figure
 
 # 设置默认字体为 SimHei
 rcParams['font.sans-serif'] = ['SimHei']
@@ -34,99 +39,238 @@ def load_sample_data(file_name):
 
 
 def fcfs(requests, head_position):
-    """先来先服务法 (FCFS)"""
+    """先来先服务法 (FCFS)，返回 (总移动长度, 服务顺序)"""
     total_movement = 0
+    order = []
     for request in requests:
         total_movement += abs(head_position - request)
         head_position = request
-    return total_movement
+        order.append(request)
+    return total_movement, order
 
 
 def sstf(requests, head_position):
-    """最短寻道时间优先 (SSTF)"""
+    """最短寻道时间优先 (SSTF)，距离相同时优先较小的磁道，返回 (总移动长度, 服务顺序)"""
     requests = sorted(requests)
     total_movement = 0
+    order = []
     while requests:
         closest_request = min(requests, key=lambda x: abs(x - head_position))
         total_movement += abs(head_position - closest_request)
         head_position = closest_request
+        order.append(closest_request)
         requests.remove(closest_request)
-    return total_movement
+    return total_movement, order
 
 
 def scan(requests, head_position, direction="从小到大"):
-    """电梯算法 (SCAN)"""
+    """电梯算法 (SCAN)，先沿指定方向服务，到达最远请求后折返，返回 (总移动长度, 服务顺序)"""
     requests = sorted(requests)
-    total_movement = 0
     if direction == "从小到大":
         # 从小到大的电梯算法
-        for request in requests:
-            if request >= head_position:
-                total_movement += abs(head_position - request)
-                head_position = request
-        total_movement += abs(head_position - requests[0])
-        head_position = requests[0]
-        for request in requests:
-            if request < head_position:
-                total_movement += abs(head_position - request)
-                head_position = request
-    elif direction == "从大到小":
+        order = [request for request in requests if request >= head_position]
+        order += [request for request in reversed(requests) if request < head_position]
+    else:
         # 从大到小的电梯算法
-        for request in reversed(requests):
-            if request <= head_position:
-                total_movement += abs(head_position - request)
-                head_position = request
-        total_movement += abs(head_position - requests[-1])
-        head_position = requests[-1]
-        for request in reversed(requests):
-            if request > head_position:
-                total_movement += abs(head_position - request)
-                head_position = request
-    return total_movement
+        order = [request for request in reversed(requests) if request <= head_position]
+        order += [request for request in requests if request > head_position]
+    total_movement = 0
+    for request in order:
+        total_movement += abs(head_position - request)
+        head_position = request
+    return total_movement, order
+
+
+# 参与对比的算法，每个算法返回 (总移动长度, 服务顺序)
+ALGORITHMS = {
+    "先来先服务法": fcfs,
+    "最短寻道时间优先": sstf,
+    "电梯算法 (从小到大)": lambda requests, head_position: scan(requests, head_position, "从小到大"),
+    "电梯算法 (从大到小)": lambda requests, head_position: scan(requests, head_position, "从大到小"),
+}
+
+# 报告中的百分位数
+PERCENTILES = [50, 90, 99]
 
 
 def calculate_average_movements(sample_data):
     """
     计算三种算法的平均寻道时间。
     """
-    fcfs_movements = []
-    sstf_movements = []
-    scan_movements_asc = []
-    scan_movements_desc = []
+    return {name: np.mean([schedule(requests, head_position)[0] for head_position, requests in sample_data])
+            for name, schedule in ALGORITHMS.items()}
+
+
+def seek_distances(order, head_position):
+    """每次寻道的移动距离"""
+    path = np.asarray([head_position] + list(order), dtype=np.int64)
+    return np.abs(np.diff(path))
 
-    for head_position, requests in sample_data:
-        fcfs_movements.append(fcfs(requests, head_position))
-        sstf_movements.append(sstf(requests, head_position))
-        scan_movements_asc.append(scan(requests, head_position, "从小到大"))
-        scan_movements_desc.append(scan(requests, head_position, "从大到小"))
 
+def waiting_positions(requests, order):
+    """
+    每个请求的服务位置与到达位置之差，正数表示被推迟，负数表示被提前。
+    重复的磁道按到达顺序依次对应服务顺序中的同一磁道。
+    """
+    arrival = np.argsort(np.asarray(requests), kind='stable')
+    service = np.argsort(np.asarray(order), kind='stable')
+    arrival_of_service = np.empty(len(order), dtype=np.int64)
+    arrival_of_service[service] = arrival
+    return np.arange(len(order)) - arrival_of_service
+
+
+def _distribution(values):
+    """一组寻道距离的均值、标准差、百分位数和最大值"""
+    if len(values) == 0:
+        return {"mean": 0.0, "std": 0.0, **{f"p{p}": 0.0 for p in PERCENTILES}, "max": 0}
+    percentiles = np.percentile(values, PERCENTILES)
     return {
-        "先来先服务法": np.mean(fcfs_movements),
-        "最短寻道时间优先": np.mean(sstf_movements),
-        "电梯算法 (从小到大)": np.mean(scan_movements_asc),
-        "电梯算法 (从大到小)": np.mean(scan_movements_desc),
+        "mean": float(np.mean(values)),
+        "std": float(np.std(values)),
+        **{f"p{p}": float(v) for p, v in zip(PERCENTILES, percentiles)},
+        "max": int(np.max(values)),
     }
 
 
-def plot_results(results):
+def build_report(sample_data, algorithms=None):
+    """
+    对每个算法、每个样例记录寻道距离分布和运行时间，运行时间即 calculate_average_movements 所用算法本身的耗时。
+
+    公平性有两个指标，方差越大说明不同请求受到的对待越不均衡：
+    wait_position_variance 为服务位置与到达位置之差的方差；
+    wait_distance_variance 为请求被服务前磁头累计移动距离的方差，它同时反映了等待的请求数和每次寻道的长短。
+
+    :return: {"samples": 每个样例一行的记录列表, "algorithms": 每个算法的汇总}
+    """
+    if algorithms is None:
+        algorithms = ALGORITHMS
+
+    samples = []
+    summary = {}
+    for name, schedule in algorithms.items():
+        totals = []
+        all_seeks = []
+        position_variances = []
+        distance_variances = []
+        runtimes = {}
+        for index, (head_position, requests) in enumerate(sample_data):
+            start = time.perf_counter()
+            total_movement, order = schedule(requests, head_position)
+            elapsed = time.perf_counter() - start
+
+            seeks = seek_distances(order, head_position)
+            position_variance = float(np.var(waiting_positions(requests, order))) if len(order) else 0.0
+            distance_variance = float(np.var(np.cumsum(seeks))) if len(seeks) else 0.0
+            totals.append(total_movement)
+            all_seeks.append(seeks)
+            position_variances.append(position_variance)
+            distance_variances.append(distance_variance)
+            runtimes.setdefault(len(requests), []).append(elapsed)
+
+            samples.append({
+                "algorithm": name,
+                "sample": index,
+                "head_position": head_position,
+                "requests": len(requests),
+                "total_movement": totals[-1],
+                **_distribution(seeks),
+                "wait_position_variance": position_variance,
+                "wait_distance_variance": distance_variance,
+                "seconds": elapsed,
+            })
+
+        summary[name] = {
+            "total_movement": _distribution(np.asarray(totals)),
+            "seek": _distribution(np.concatenate(all_seeks) if all_seeks else np.asarray([])),
+            "wait_position_variance": float(np.mean(position_variances)) if position_variances else 0.0,
+            "wait_distance_variance": float(np.mean(distance_variances)) if distance_variances else 0.0,
+            # 按样例规模统计的平均运行时间（秒）
+            "seconds": {size: float(np.mean(values)) for size, values in sorted(runtimes.items())},
+        }
+    return {"samples": samples, "algorithms": summary}
+
+
+def write_report_json(report, file_name):
+    with open(file_name, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def write_report_csv(report, file_name):
+    """每个算法、每个样例一行"""
+    with open(file_name, 'w', newline='', encoding='utf-8') as file:
+        if not report["samples"]:
+            return
+        writer = csv.DictWriter(file, fieldnames=list(report["samples"][0].keys()))
+        writer.writeheader()
+        writer.writerows(report["samples"])
+
+
+def plot_results(results, file_name=None):
     """
     绘制三种算法的平均寻道时间对比图。
+    指定 file_name 时不弹出窗口，直接渲染到文件，可在无图形界面的环境中使用。
     """
     algorithms = list(results.keys())
     average_movements = list(results.values())
 
-    plt.bar(algorithms, average_movements)
-    plt.title("不同算法平均寻道时间对比")
-    plt.xlabel("调度算法")
-    plt.ylabel("平均寻道时间")
-    plt.xticks(rotation=45, ha='right')  # 旋转X轴标签以适应长文字
-    plt.tight_layout()  # 自动调整布局
-    plt.show()
+    if file_name is None:
+        plt.bar(algorithms, average_movements)
+        plt.title("不同算法平均寻道时间对比")
+        plt.xlabel("调度算法")
+        plt.ylabel("平均寻道时间")
+        plt.xticks(rotation=45, ha='right')  # 旋转X轴标签以适应长文字
+        plt.tight_layout()  # 自动调整布局
+        plt.show()
+        return
+
+    figure = Figure()
+    ax = figure.add_subplot(111)
+    ax.bar(algorithms, average_movements)
+    ax.set_title("不同算法平均寻道时间对比")
+    ax.set_xlabel("调度算法")
+    ax.set_ylabel("平均寻道时间")
+    ax.tick_params(axis='x', labelrotation=45)
+    figure.tight_layout()
+    figure.savefig(file_name)
+
+
+def plot_report(report, output_dir):
+    """将单次寻道距离分布和运行时间渲染为图片文件"""
+    algorithms = list(report["algorithms"].keys())
+
+    figure = Figure()
+    ax = figure.add_subplot(111)
+    seeks = [[row["mean"] for row in report["samples"] if row["algorithm"] == name] for name in algorithms]
+    ax.boxplot(seeks)
+    ax.set_xticks(range(1, len(algorithms) + 1), algorithms, rotation=45, ha='right')
+    ax.set_title("各样例平均单次寻道距离分布")
+    ax.set_ylabel("平均单次寻道距离")
+    figure.tight_layout()
+    figure.savefig(os.path.join(output_dir, "seek_distribution.png"))
+
+    figure = Figure()
+    ax = figure.add_subplot(111)
+    for name in algorithms:
+        runtimes = report["algorithms"][name]["seconds"]
+        ax.plot(list(runtimes.keys()), list(runtimes.values()), marker='o', label=name)
+    ax.set_title("算法运行时间")
+    ax.set_xlabel("请求数量")
+    ax.set_ylabel("平均运行时间 (秒)")
+    ax.legend()
+    figure.tight_layout()
+    figure.savefig(os.path.join(output_dir, "runtime.png"))
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="磁盘调度算法对比")
+    parser.add_argument("file_path", nargs="?",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "large_samples.txt"),
+                        help="样例文件路径")
+    parser.add_argument("--output-dir", help="将 JSON/CSV 报告和图片写入该目录，不弹出窗口")
+    args = parser.parse_args()
+
     # 选择文件路径
-    file_path = "C:\\Users\\13620\\PycharmProjects\\OS_experiment\\task2\\large_samples.txt"
+    file_path = args.file_path
 
     # 检查文件是否存在
     if not os.path.exists(file_path):
@@ -146,5 +290,15 @@ if __name__ == "__main__":
             for algo, avg_movement in results.items():
                 print(f"{algo}: {avg_movement:.2f}")
 
-            # 绘制结果图
-            plot_results(results)
+            if args.output_dir:
+                # 生成详细报告并渲染到文件
+                os.makedirs(args.output_dir, exist_ok=True)
+                report = build_report(sample_data)
+                write_report_json(report, os.path.join(args.output_dir, "report.json"))
+                write_report_csv(report, os.path.join(args.output_dir, "report.csv"))
+                plot_results(results, os.path.join(args.output_dir, "average_movements.png"))
+                plot_report(report, args.output_dir)
+                print(f"报告已写入 {args.output_dir}")
+            else:
+                # 绘制结果图
+                plot_results(results)
@@ -1,39 +1,238 @@
-import random
+import numpy as np
 
+# 支持的请求分布
+PATTERNS = ["uniform", "zipf", "sequential", "bursty"]
 
-def generate_large_sample(num_requests, min_value, max_value):
+# 超过该数量的请求会被分块生成和写出，避免一次性占用过多内存
+CHUNK_SIZE = 1 << 22
+
+# 二进制样例文件的文件头标识
+BINARY_MAGIC = b'DISKREQ1'
+
+
+def _uniform(rng, n, span):
+    return rng.integers(0, span, n, dtype=np.int64)
+
+
+def _zipf(rng, n, span, zipf_a=1.2):
+    """ 热点分布：排名服从 Zipf 分布，再通过乘法散列把热点柱面打散到整个范围 """
+    ranks = (rng.zipf(zipf_a, n) - 1) % span
+    offset = int(rng.integers(0, span))
+    return ((ranks.astype(np.uint64) * np.uint64(2654435761) + np.uint64(offset)) % np.uint64(span)).astype(np.int64)
+
+
+def _runs(rng, n, mean_length):
+    """ 生成若干段长度服从几何分布的连续片段，返回 (片段编号, 片段内偏移, 片段数) """
+    lengths = rng.geometric(1.0 / mean_length, n // mean_length + 1)
+    while lengths.sum() < n:
+        lengths = np.concatenate([lengths, rng.geometric(1.0 / mean_length, n // mean_length + 1)])
+    run_id = np.repeat(np.arange(len(lengths)), lengths)[:n]
+    starts = np.cumsum(lengths) - lengths
+    return run_id, np.arange(n) - starts[run_id], len(lengths)
+
+
+def _sequential(rng, n, span, mean_run=64):
+    """ 顺序访问：若干段从随机位置开始、柱面号逐一递增的连续请求 """
+    run_id, offset, num_runs = _runs(rng, n, mean_run)
+    starts = rng.integers(0, span, num_runs, dtype=np.int64)
+    return (starts[run_id] + offset) % span
+
+
+def _bursty(rng, n, span, mean_burst=32, spread=0.01):
+    """ 局部性突发：每一段请求集中在某个随机中心附近，偏移服从正态分布 """
+    run_id, _, num_runs = _runs(rng, n, mean_burst)
+    centers = rng.integers(0, span, num_runs, dtype=np.int64)
+    deviation = np.rint(rng.normal(0.0, max(spread * span, 1.0), n)).astype(np.int64)
+    return np.clip(centers[run_id] + deviation, 0, span - 1)
+
+
+_GENERATORS = {
+    "uniform": _uniform,
+    "zipf": _zipf,
+    "sequential": _sequential,
+    "bursty": _bursty,
+}
+
+
+def _deduplicate(rng, values, n, span, pattern, **params):
+    """ 去掉重复请求并保持原有顺序，不足的部分继续按同一分布补齐，多次仍不足时用未出现过的柱面补齐 """
+    for _ in range(8):
+        _, first = np.unique(values, return_index=True)
+        values = values[np.sort(first)]
+        if len(values) >= n:
+            return values[:n]
+        extra = _GENERATORS[pattern](rng, n - len(values), span, **params)
+        values = np.concatenate([values, extra])
+    _, first = np.unique(values, return_index=True)
+    values = values[np.sort(first)]
+    unused = np.setdiff1d(np.arange(span, dtype=np.int64), values, assume_unique=True)
+    return np.concatenate([values, rng.choice(unused, n - len(values), replace=False)])
+
+
+def generate_requests(num_requests, min_value, max_value, pattern="uniform", unique=False, rng=None, **params):
+    """
+    使用 NumPy 向量化生成请求序列。
+
+    :param num_requests: 访问请求的数量
+    :param min_value: 请求的最小值
+    :param max_value: 请求的最大值
+    :param pattern: 请求分布，可选 "uniform"、"zipf"、"sequential"、"bursty"
+    :param unique: 是否要求请求互不重复
+    :param rng: numpy.random.Generator，传入同一种子的生成器可复现结果
+    :param params: 传给具体分布的参数，如 zipf_a、mean_run、mean_burst、spread
+    :return: 请求序列 (numpy.ndarray, int64)
+    """
+    if pattern not in _GENERATORS:
+        raise ValueError(f"未知的请求分布: {pattern}")
+    span = max_value - min_value + 1
+    if span <= 0:
+        raise ValueError("请求的最大值不能小于最小值")
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if unique:
+        if num_requests > span:
+            raise ValueError("要求请求互不重复时，请求数量不能超过取值范围")
+        if pattern == "uniform":
+            values = rng.choice(span, num_requests, replace=False).astype(np.int64)
+        else:
+            values = _deduplicate(rng, _GENERATORS[pattern](rng, num_requests, span, **params),
+                                  num_requests, span, pattern, **params)
+    else:
+        values = _GENERATORS[pattern](rng, num_requests, span, **params)
+    return values + min_value
+
+
+def generate_large_sample(num_requests, min_value, max_value, pattern="uniform", unique=True, rng=None, **params):
     """
     生成一个大样例数据集。
 
     :param num_requests: 访问请求的数量
     :param min_value: 请求的最小值
     :param max_value: 请求的最大值
+    :param pattern: 请求分布，见 generate_requests
+    :param unique: 是否要求请求互不重复
+    :param rng: numpy.random.Generator
     :return: 一个包含请求序列的元组 (head_position, requests)
     """
+    if rng is None:
+        rng = np.random.default_rng()
+
     # 随机生成初始磁头位置
-    head_position = random.randint(min_value, max_value)
+    head_position = int(rng.integers(min_value, max_value + 1))
+
+    # 生成请求序列
+    requests = generate_requests(num_requests, min_value, max_value, pattern, unique, rng, **params)
+
+    return head_position, requests.tolist()
 
-    # 随机生成请求序列
-    requests = random.sample(range(min_value, max_value + 1), num_requests)
 
-    return head_position, requests
+def _sample_chunks(rng, num_requests, min_value, max_value, pattern, unique, chunk_size, **params):
+    """ 分块生成一个样例的请求序列，每块不超过 chunk_size 个请求 """
+    remaining = num_requests
+    while remaining > 0:
+        size = min(remaining, chunk_size)
+        yield generate_requests(size, min_value, max_value, pattern, unique, rng, **params)
+        remaining -= size
 
 
-def save_sample_to_file(filename, num_samples, num_requests, min_value, max_value):
+def _binary_dtype(dtype, min_value, max_value):
+    """ 未指定类型时按取值范围选择 int32 或 int64，指定的类型装不下取值范围时报错 """
+    if dtype is None:
+        info = np.iinfo(np.int32)
+        dtype = np.int32 if info.min <= min_value and max_value <= info.max else np.int64
+    dtype = np.dtype(dtype).newbyteorder('<')
+    info = np.iinfo(dtype)
+    if min_value < info.min or max_value > info.max:
+        raise ValueError(f"请求范围 [{min_value}, {max_value}] 超出了 {dtype} 能表示的范围")
+    return dtype
+
+
+def save_sample_to_file(filename, num_samples, num_requests, min_value, max_value, pattern="uniform",
+                        unique=True, seed=None, binary=False, dtype=None, chunk_size=CHUNK_SIZE, **params):
     """
-    生成多个样例并保存到文件中。
+    生成多个样例并以流式方式写入文件，内存占用只与分块大小有关。
+
+    文本格式每一行为：磁头位置,请求1,请求2,...
+    二进制格式以 BINARY_MAGIC 和 8 字节的请求类型描述（如 "<i4"）开头，
+    之后每个样例为两个 int64（磁头位置、请求数量），随后是该类型的请求序列。
 
     :param filename: 输出文件名
     :param num_samples: 需要生成的样例数量
     :param num_requests: 每个样例中的请求数量
     :param min_value: 请求的最小值
     :param max_value: 请求的最大值
+    :param pattern: 请求分布，见 generate_requests
+    :param unique: 是否要求每个样例中的请求互不重复
+    :param seed: 随机种子，相同的种子生成相同的文件
+    :param binary: 是否写成二进制格式
+    :param dtype: 二进制格式中请求的整数类型，默认按取值范围选择 int32 或 int64
+    :param chunk_size: 每次生成和写出的请求数量
     """
-    with open(filename, 'w') as file:
+    # 所有参数在打开文件之前检查，避免参数错误时留下只写了一部分的文件
+    if pattern not in _GENERATORS:
+        raise ValueError(f"未知的请求分布: {pattern}")
+    if max_value < min_value:
+        raise ValueError("请求的最大值不能小于最小值")
+    if chunk_size < 1:
+        raise ValueError("分块大小必须大于 0")
+    if unique and num_requests > max_value - min_value + 1:
+        raise ValueError("要求请求互不重复时，请求数量不能超过取值范围")
+    if unique and num_requests > chunk_size:
+        raise ValueError("要求请求互不重复时，单个样例的请求数量不能超过分块大小")
+    if binary:
+        dtype = _binary_dtype(dtype, min_value, max_value)
+    rng = np.random.default_rng(seed)
+    with open(filename, 'wb' if binary else 'w') as file:
+        if binary:
+            file.write(BINARY_MAGIC + dtype.str.encode('ascii').ljust(8, b'\0'))
         for _ in range(num_samples):
-            head_position, requests = generate_large_sample(num_requests, min_value, max_value)
-            # 写入初始磁头位置和请求序列
-            file.write(f"{head_position},{','.join(map(str, requests))}\n")
+            head_position = int(rng.integers(min_value, max_value + 1))
+            chunks = _sample_chunks(rng, num_requests, min_value, max_value, pattern, unique, chunk_size, **params)
+            if binary:
+                np.array([head_position, num_requests], dtype='<i8').tofile(file)
+                for chunk in chunks:
+                    chunk.astype(dtype).tofile(file)
+            else:
+                # 写入初始磁头位置和请求序列
+                file.write(str(head_position))
+                for chunk in chunks:
+                    file.write(',')
+                    file.write(','.join(map(str, chunk.tolist())))
+                file.write('\n')
+
+
+def load_binary_samples(filename):
+    """
+    读取 save_sample_to_file(binary=True) 写出的文件，请求类型从文件头读取。
+    请求序列以内存映射方式返回，不会整体读入内存。
+
+    :return: [(head_position, requests), ...]
+    """
+    data = np.memmap(filename, dtype=np.uint8, mode='r')
+    magic_size = len(BINARY_MAGIC)
+    if bytes(data[:magic_size]) != BINARY_MAGIC:
+        raise ValueError(f"{filename} 不是样例二进制文件")
+    if len(data) < magic_size + 8:
+        raise ValueError(f"{filename} 已截断：文件头不完整")
+    dtype = np.dtype(bytes(data[magic_size:magic_size + 8]).rstrip(b'\0').decode('ascii'))
+
+    sample_header_size = 2 * np.dtype('<i8').itemsize
+    samples = []
+    offset = magic_size + 8
+    while offset < len(data):
+        if offset + sample_header_size > len(data):
+            raise ValueError(f"{filename} 已截断：第 {len(samples) + 1} 个样例的头部不完整")
+        head_position, count = np.frombuffer(data, dtype='<i8', count=2, offset=offset)
+        offset += sample_header_size
+        end = offset + int(count) * dtype.itemsize
+        if count < 0 or end > len(data):
+            raise ValueError(f"{filename} 已截断：第 {len(samples) + 1} 个样例应有 {int(count)} 个请求，"
+                             f"文件中只剩 {(len(data) - offset) // dtype.itemsize} 个")
+        requests = np.frombuffer(data, dtype=dtype, count=int(count), offset=offset)
+        samples.append((int(head_position), requests))
+        offset = end
+    return samples
 
 
 if __name__ == "__main__":